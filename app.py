@@ -4,13 +4,23 @@ Flask Backend for Gym Equipment Usage Prediction
 Loads trained ML model and provides API endpoint for predictions.
 """
 
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, send_from_directory, url_for
 from flask_cors import CORS
 import joblib
 import pandas as pd
 import os
+import json
+import mimetypes
+import atexit
+import threading
 from datetime import datetime
 from dotenv import load_dotenv
+from tree_explainer import ForestExplainer
+from drift_monitor import DriftMonitor
+from request_capture import RequestCapture
+from compact_forest import CompactForest
+from frequency_index import DAY_MAPPING
+import build_static
 
 # Load environment variables from .env (if present)
 load_dotenv()
@@ -30,11 +40,64 @@ DEBUG = os.getenv("FLASK_DEBUG", "1") in ("1", "true", "True")
 MODEL_DIR = os.getenv("MODEL_DIR", "models")
 MODEL_FILE = os.getenv("MODEL_FILE", "gym_model.pkl")
 MODEL_PATH = os.path.join(MODEL_DIR, MODEL_FILE)
+COMPACT_MODEL_PATH = os.path.join(MODEL_DIR, os.getenv("COMPACT_MODEL_FILE", "gym_model_compact.pkl"))
+# "sklearn" loads the pickled forest, "compact" the float32 export (no explanations)
+MODEL_FORMATS = ("sklearn", "compact")
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "sklearn").strip().lower()
+if MODEL_FORMAT not in MODEL_FORMATS:
+    print(f"⚠️ Unknown MODEL_FORMAT '{MODEL_FORMAT}' (expected one of {', '.join(MODEL_FORMATS)}) - using sklearn")
+    MODEL_FORMAT = "sklearn"
 ONEHOT_ENCODER_PATH = os.path.join(MODEL_DIR, os.getenv("ONEHOT_ENCODER_FILE", "onehot_encoder.pkl"))
 LABEL_ENCODER_PATH = os.path.join(MODEL_DIR, os.getenv("LABEL_ENCODER_FILE", "label_encoder.pkl"))
 FEATURE_COLUMNS_PATH = os.path.join(MODEL_DIR, os.getenv("FEATURE_COLUMNS_FILE", "feature_columns.pkl"))
 CATEGORICAL_COLS_PATH = os.path.join(MODEL_DIR, os.getenv("CATEGORICAL_COLS_FILE", "categorical_cols.pkl"))
 NUMERICAL_COLS_PATH = os.path.join(MODEL_DIR, os.getenv("NUMERICAL_COLS_FILE", "numerical_cols.pkl"))
+FREQUENCY_INDEX_PATH = os.path.join(MODEL_DIR, os.getenv("FREQUENCY_INDEX_FILE", "frequency_index.pkl"))
+DRIFT_REFERENCE_PATH = os.path.join(MODEL_DIR, os.getenv("DRIFT_REFERENCE_FILE", "drift_reference.pkl"))
+# Drift scores cover the last DRIFT_WINDOW_SIZE to 2 * DRIFT_WINDOW_SIZE requests
+DRIFT_WINDOW_SIZE = int(os.getenv("DRIFT_WINDOW_SIZE", 2500))
+DRIFT_MIN_SAMPLES = int(os.getenv("DRIFT_MIN_SAMPLES", 500))
+
+# Request/outcome capture for retraining data (written asynchronously)
+CAPTURE_ENABLED = os.getenv("CAPTURE_ENABLED", "1") in ("1", "true", "True")
+CAPTURE_DIR = os.getenv("CAPTURE_DIR", "captures")
+CAPTURE_MAX_QUEUE = int(os.getenv("CAPTURE_MAX_QUEUE", 10000))
+CAPTURE_MAX_FILE_RECORDS = int(os.getenv("CAPTURE_MAX_FILE_RECORDS", 50000))
+CAPTURE_MAX_FILES = int(os.getenv("CAPTURE_MAX_FILES", 100))
+
+# Hashed, precompressed static assets built by build_static.py
+ASSET_DIR = os.path.join(app.static_folder, "dist")
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+BOOTSTRAP_MAX_AGE = int(os.getenv("BOOTSTRAP_MAX_AGE", 300))
+# Rebuild hashed assets on startup when static/ changed since the last build
+BUILD_STATIC_ON_START = os.getenv("BUILD_STATIC_ON_START", "1") in ("1", "true", "True")
+
+# Load shedding: concurrent forest predictions above this limit are served from the frequency index
+MAX_FOREST_INFLIGHT = int(os.getenv("MAX_FOREST_INFLIGHT", 8))
+PREDICTION_MODES = ("auto", "forest", "frequency")
+
+FALLBACK_OPTIONS = {
+    "machines": [
+        "Treadmill", "Elliptical", "Stationary Bike", "Rowing Machine",
+        "Bench Press", "Leg Press", "Cable Machine", "Smith Machine",
+        "Dumbbells", "Barbell", "Pull-up Bar", "Lat Pulldown",
+        "Leg Curl", "Leg Extension", "Chest Press", "Shoulder Press"
+    ],
+    "workout_plans": [
+        "Cardio", "Strength", "Endurance", "Flexibility",
+        "HIIT", "Circuit Training", "Powerlifting", "Bodybuilding"
+    ],
+    "muscle_groups": [
+        "Legs", "Chest", "Back", "Arms", "Shoulders",
+        "Core", "Full Body", "Cardio", "Glutes", "Biceps", "Triceps"
+    ]
+}
+
+SUGGESTIONS = {
+    "Low": "Free now - Machine is available!",
+    "Medium": "Moderately busy – try after 15 minutes",
+    "High": "Busy – return after 30–45 minutes"
+}
 
 # Global variables for loaded models
 model = None
@@ -43,21 +106,66 @@ label_encoder = None
 feature_columns = None
 categorical_cols = None
 numerical_cols = None
+forest_explainer = None
+model_loading = False
+model_version = None
+
+# Dropdown options read from the dataset (cached after the first successful read)
+options_cache = None
+
+# Original static filename -> hashed filename in ASSET_DIR
+asset_manifest = {}
+
+# Historical frequency index (fallback predictor)
+frequency_index = None
+index_machine_lookup = None
+index_probabilities = None
+index_classes = None
+
+# Streaming input drift tracking against training-time distributions
+drift_monitor = None
+
+# Background request/outcome capture (started in __main__)
+request_capture = None
+
+forest_slots = threading.BoundedSemaphore(MAX_FOREST_INFLIGHT)
 
 
 def load_models():
     """Load all trained models and encoders."""
-    global model, onehot_encoder, label_encoder, feature_columns, categorical_cols, numerical_cols
+    global model, onehot_encoder, label_encoder, feature_columns, categorical_cols, numerical_cols, model_loading
+    global forest_explainer, model_version
     
+    model_loading = True
     try:
         print("Loading models...")
-        model = joblib.load(MODEL_PATH)
-        onehot_encoder = joblib.load(ONEHOT_ENCODER_PATH)
-        label_encoder = joblib.load(LABEL_ENCODER_PATH)
-        feature_columns = joblib.load(FEATURE_COLUMNS_PATH)
-        categorical_cols = joblib.load(CATEGORICAL_COLS_PATH)
-        numerical_cols = joblib.load(NUMERICAL_COLS_PATH)
-        print("✅ All models loaded successfully!")
+        # Load into locals first so requests never see a half-loaded set
+        loaded_onehot_encoder = joblib.load(ONEHOT_ENCODER_PATH)
+        loaded_label_encoder = joblib.load(LABEL_ENCODER_PATH)
+        loaded_feature_columns = joblib.load(FEATURE_COLUMNS_PATH)
+        loaded_categorical_cols = joblib.load(CATEGORICAL_COLS_PATH)
+        loaded_numerical_cols = joblib.load(NUMERICAL_COLS_PATH)
+        model_path = COMPACT_MODEL_PATH if MODEL_FORMAT == "compact" else MODEL_PATH
+        loaded_version = f"{MODEL_FORMAT}-{datetime.fromtimestamp(os.path.getmtime(model_path)):%Y%m%d%H%M%S}"
+        if MODEL_FORMAT == "compact":
+            loaded_model = CompactForest(joblib.load(COMPACT_MODEL_PATH))
+            loaded_explainer = None
+        else:
+            loaded_model = joblib.load(MODEL_PATH)
+            loaded_explainer = ForestExplainer(
+                loaded_model, loaded_feature_columns, loaded_categorical_cols,
+                loaded_numerical_cols, loaded_onehot_encoder
+            )
+
+        onehot_encoder = loaded_onehot_encoder
+        label_encoder = loaded_label_encoder
+        feature_columns = loaded_feature_columns
+        categorical_cols = loaded_categorical_cols
+        numerical_cols = loaded_numerical_cols
+        forest_explainer = loaded_explainer
+        model_version = loaded_version
+        model = loaded_model
+        print(f"✅ All models loaded successfully! (format: {MODEL_FORMAT})")
         return True
     except FileNotFoundError as e:
         print(f"❌ Error: Model file not found - {e}")
@@ -66,9 +174,165 @@ def load_models():
     except Exception as e:
         print(f"❌ Error loading models: {e}")
         return False
+    finally:
+        model_loading = False
+
+
+def load_asset_manifest():
+    """Load the hashed static asset manifest written by build_static.py."""
+    global asset_manifest
+    
+    try:
+        with open(os.path.join(ASSET_DIR, "manifest.json")) as f:
+            asset_manifest = json.load(f)
+        print("✅ Static asset manifest loaded successfully!")
+        return True
+    except FileNotFoundError:
+        print("⚠️ Static assets not built - serving unhashed files (run build_static.py)")
+        return False
+
+
+@app.context_processor
+def inject_asset_url():
+    """Expose asset_url() to templates, preferring hashed assets when built."""
+    def asset_url(filename):
+        if filename in asset_manifest:
+            return url_for('hashed_asset', filename=asset_manifest[filename])
+        return url_for('static', filename=filename)
+    return {"asset_url": asset_url}
+
+
+def get_options_data():
+    """Dropdown options from the dataset, falling back to common options."""
+    global options_cache
+    
+    if options_cache is not None:
+        return options_cache
+    try:
+        # Load dataset to get unique values
+        df = pd.read_excel(os.getenv("DATA_FILE", "gym_machine_usage_10000_balanced.xlsx"))
+        
+        # Get unique values for each category
+        options_cache = {
+            "machines": sorted(df['machine_name'].unique().tolist()),
+            "workout_plans": sorted(df['workout_plan'].unique().tolist()),
+            "muscle_groups": sorted(df['muscle_group'].unique().tolist())
+        }
+        return options_cache
+    except Exception:
+        # Fallback to common options if dataset can't be loaded
+        return FALLBACK_OPTIONS
 
 
-def predict_crowd_level(machine_name, workout_day, workout_plan, muscle_group, start_hour, duration_min):
+def load_frequency_index():
+    """Load the historical frequency index used as a fallback predictor."""
+    global frequency_index, index_machine_lookup, index_probabilities, index_classes
+    
+    try:
+        loaded_index = joblib.load(FREQUENCY_INDEX_PATH)
+        machines = loaded_index["machines"]
+        # Unknown machines map to the final, all-machines row
+        index_machine_lookup = {machine: i for i, machine in enumerate(machines)}
+        index_machine_lookup[None] = len(machines)
+        index_probabilities = loaded_index["probabilities"]
+        index_classes = loaded_index["classes"]
+        frequency_index = loaded_index
+        print("✅ Frequency index loaded successfully!")
+        return True
+    except FileNotFoundError as e:
+        print(f"⚠️ Frequency index not found - {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Error loading frequency index: {e}")
+        return False
+
+
+def load_drift_reference():
+    """Load training-time reference distributions and start drift tracking."""
+    global drift_monitor
+    
+    try:
+        drift_monitor = DriftMonitor(
+            joblib.load(DRIFT_REFERENCE_PATH),
+            window_size=DRIFT_WINDOW_SIZE,
+            min_samples=DRIFT_MIN_SAMPLES
+        )
+        print("✅ Drift reference loaded successfully!")
+        return True
+    except FileNotFoundError as e:
+        print(f"⚠️ Drift reference not found - {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Error loading drift reference: {e}")
+        return False
+
+
+def track_drift(data, crowd_level):
+    """Record a validated request and its prediction in the drift monitor."""
+    if drift_monitor is None:
+        return
+    drift_monitor.update(
+        categorical_values={
+            'workout_plan': data['workout_plan'],
+            'workout_day': data['workout_day'],
+            'muscle_group': data['muscle_group'],
+            'machine_name': data['machine_name']
+        },
+        numerical_values={
+            'start_hour': data['start_hour'],
+            'duration_min': data['duration_min'],
+            'day_of_week_num': DAY_MAPPING[data['workout_day']]
+        },
+        crowd_level=crowd_level
+    )
+
+
+def capture_prediction(data, result):
+    """Queue a validated request and its outcome for the background capture writer."""
+    if request_capture is None:
+        return
+    request_capture.submit({
+        "timestamp": datetime.now().isoformat(),
+        "machine_name": data['machine_name'],
+        "workout_day": data['workout_day'],
+        "workout_plan": data['workout_plan'],
+        "muscle_group": data['muscle_group'],
+        "start_hour": int(data['start_hour']),
+        "duration_min": int(data['duration_min']),
+        "day_of_week_num": DAY_MAPPING[data['workout_day']],
+        "crowd_level": result['crowd_level'],
+        "probabilities": result['probabilities'],
+        "predictor": result['predictor']
+    })
+
+
+def predict_from_frequency_index(machine_name, workout_day, start_hour):
+    """
+    Predict crowd level from historical frequencies with a single array lookup.
+    
+    Args:
+        machine_name: Name of the gym machine
+        workout_day: Day of the week (Monday-Sunday)
+        start_hour: Hour of the day (0-23)
+    
+    Returns:
+        dict: Prediction result with crowd_level and suggestion
+    """
+    machine_idx = index_machine_lookup.get(machine_name, index_machine_lookup[None])
+    proba = index_probabilities[machine_idx, DAY_MAPPING.get(workout_day, 0), start_hour]
+    crowd_level = index_classes[int(proba.argmax())]
+    
+    return {
+        "success": True,
+        "crowd_level": crowd_level,
+        "suggestion": SUGGESTIONS.get(crowd_level, "Unable to determine availability"),
+        "probabilities": dict(zip(index_classes, proba.tolist())),
+        "predictor": "frequency_index"
+    }
+
+
+def predict_crowd_level(machine_name, workout_day, workout_plan, muscle_group, start_hour, duration_min,
+                        explain=False):
     """
     Make prediction using the loaded model.
     
@@ -79,17 +343,14 @@ def predict_crowd_level(machine_name, workout_day, workout_plan, muscle_group, s
         muscle_group: Target muscle group
         start_hour: Hour of the day (0-23)
         duration_min: Duration in minutes
+        explain: Include per-feature contributions to the probabilities
     
     Returns:
         dict: Prediction result with crowd_level and suggestion
     """
     try:
         # Convert date to day of week number
-        day_mapping = {
-            'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
-            'Friday': 4, 'Saturday': 5, 'Sunday': 6
-        }
-        day_of_week_num = day_mapping.get(workout_day, 0)
+        day_of_week_num = DAY_MAPPING.get(workout_day, 0)
         
         # Prepare categorical features - CRITICAL: Use exact same column order as training
         # Create DataFrame with values in the exact order of categorical_cols
@@ -167,19 +428,31 @@ def predict_crowd_level(machine_name, workout_day, workout_plan, muscle_group, s
         crowd_level = label_encoder.inverse_transform([prediction_encoded])[0]
         
         # Generate suggestion
-        suggestions = {
-            "Low": "Free now - Machine is available!",
-            "Medium": "Moderately busy – try after 15 minutes",
-            "High": "Busy – return after 30–45 minutes"
-        }
-        suggestion = suggestions.get(crowd_level, "Unable to determine availability")
+        suggestion = SUGGESTIONS.get(crowd_level, "Unable to determine availability")
         
-        return {
+        result = {
             "success": True,
             "crowd_level": crowd_level,
             "suggestion": suggestion,
-            "probabilities": dict(zip(label_classes.tolist(), prediction_proba.tolist()))
+            "probabilities": dict(zip(label_classes.tolist(), prediction_proba.tolist())),
+            "predictor": "forest"
         }
+        
+        if explain and forest_explainer is None:
+            result["explanation"] = None
+            result["explanation_unavailable"] = "Explanations need the sklearn forest (MODEL_FORMAT=sklearn)"
+        elif explain:
+            # Contributions per original column; bias + contributions sum to probabilities
+            bias, contributions = forest_explainer.explain(X_final)
+            result["explanation"] = {
+                "bias": dict(zip(label_classes.tolist(), bias.tolist())),
+                "contributions": {
+                    col: dict(zip(label_classes.tolist(), values))
+                    for col, values in zip(forest_explainer.columns, contributions[0].tolist())
+                }
+            }
+        
+        return result
     
     except Exception as e:
         import traceback
@@ -210,15 +483,18 @@ def predict():
         "workout_plan": "Cardio",
         "muscle_group": "Legs",
         "start_hour": 18,
-        "duration_min": 30
+        "duration_min": 30,
+        "mode": "auto",           (optional: auto | forest | frequency)
+        "explain": false          (optional, also accepted as ?explain=true)
     }
-    """
-    if model is None:
-        return jsonify({
-            "success": False,
-            "error": "Model not loaded. Please ensure models are trained."
-        }), 500
     
+    In "auto" mode the forest answers unless it is still loading or more than
+    MAX_FOREST_INFLIGHT predictions are in flight, in which case the historical
+    frequency index answers instead. The response's "predictor" field reports
+    which one was used. With explain=true, the response always has an
+    "explanation" key: per-feature contributions folded back to the original
+    input columns, or null with an "explanation_unavailable" reason.
+    """
     try:
         data = request.get_json()
         
@@ -255,17 +531,68 @@ def predict():
                 "error": "duration_min must be between 1 and 300"
             }), 400
         
-        # Make prediction
-        result = predict_crowd_level(
-            machine_name=data['machine_name'],
-            workout_day=data['workout_day'],
-            workout_plan=data['workout_plan'],
-            muscle_group=data['muscle_group'],
-            start_hour=int(data['start_hour']),
-            duration_min=int(data['duration_min'])
-        )
+        # Validate mode
+        mode = data.get('mode', 'auto')
+        if mode not in PREDICTION_MODES:
+            return jsonify({
+                "success": False,
+                "error": f"Invalid mode. Must be one of: {list(PREDICTION_MODES)}"
+            }), 400
+        
+        if mode == 'forest' and model is None:
+            return jsonify({
+                "success": False,
+                "error": "Model not loaded. Please ensure models are trained."
+            }), 503
+        
+        if (mode == 'frequency' or model is None) and frequency_index is None:
+            return jsonify({
+                "success": False,
+                "error": "Model not loaded. Please ensure models are trained."
+            }), 503
+        
+        explain = str(request.args.get('explain', data.get('explain', False))).lower() in ('true', '1')
+        
+        if mode == 'frequency' or model is None:
+            result = predict_from_frequency_index(
+                machine_name=data['machine_name'],
+                workout_day=data['workout_day'],
+                start_hour=int(data['start_hour'])
+            )
+        else:
+            # Shed load to the frequency index when the forest is saturated
+            acquired = forest_slots.acquire(blocking=False)
+            if not acquired and mode == 'auto' and frequency_index is not None:
+                result = predict_from_frequency_index(
+                    machine_name=data['machine_name'],
+                    workout_day=data['workout_day'],
+                    start_hour=int(data['start_hour'])
+                )
+            else:
+                if not acquired:
+                    forest_slots.acquire()
+                
+                # Make prediction
+                try:
+                    result = predict_crowd_level(
+                        machine_name=data['machine_name'],
+                        workout_day=data['workout_day'],
+                        workout_plan=data['workout_plan'],
+                        muscle_group=data['muscle_group'],
+                        start_hour=int(data['start_hour']),
+                        duration_min=int(data['duration_min']),
+                        explain=explain
+                    )
+                finally:
+                    forest_slots.release()
+        
+        if result['success'] and explain and result['predictor'] == 'frequency_index':
+            result["explanation"] = None
+            result["explanation_unavailable"] = "Frequency index predictions are not explained"
         
         if result['success']:
+            track_drift(data, result['crowd_level'])
+            capture_prediction(data, result)
             return jsonify(result), 200
         else:
             return jsonify(result), 500
@@ -277,12 +604,71 @@ def predict():
         }), 500
 
 
+@app.route('/assets/<path:filename>')
+def hashed_asset(filename):
+    """Serve a content-hashed asset, precompressed when the client accepts it."""
+    mimetype = mimetypes.guess_type(filename)[0]
+    
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        # Quality 0 (e.g. "br;q=0") means the client refuses the encoding
+        if request.accept_encodings[encoding] > 0 and os.path.isfile(os.path.join(ASSET_DIR, filename + suffix)):
+            response = send_from_directory(ASSET_DIR, filename + suffix, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(ASSET_DIR, filename, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+    
+    # Hashed names change with content, so they can be cached forever
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+@app.route('/api/bootstrap', methods=['GET'])
+def bootstrap():
+    """
+    Everything the UI needs on page load in one cacheable response:
+    dropdown options, model version and health.
+    """
+    response = jsonify({
+        "success": True,
+        "options": get_options_data(),
+        "model": {
+            "loaded": model is not None,
+            "loading": model_loading,
+            "format": MODEL_FORMAT,
+            "version": model_version
+        },
+        "health": {
+            "status": "healthy",
+            "model_loaded": model is not None,
+            "frequency_index_loaded": frequency_index is not None
+        }
+    })
+    
+    # Don't let clients hold on to a "still loading" payload
+    if model is None:
+        response.cache_control.no_cache = True
+    else:
+        response.cache_control.public = True
+        response.cache_control.max_age = BOOTSTRAP_MAX_AGE
+    response.add_etag()
+    return response.make_conditional(request)
+
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint."""
     return jsonify({
         "status": "healthy",
         "model_loaded": model is not None,
+        "model_loading": model_loading,
+        "model_format": MODEL_FORMAT,
+        "model_version": model_version,
+        "frequency_index_loaded": frequency_index is not None,
+        "drift": drift_monitor.scores() if drift_monitor is not None else None,
+        "capture": request_capture.stats() if request_capture is not None else None,
         "timestamp": datetime.now().isoformat()
     })
 
@@ -292,45 +678,29 @@ def get_options():
     """
     Get available options for dropdowns from the dataset.
     """
-    try:
-        # Load dataset to get unique values
-        df = pd.read_excel(os.getenv("DATA_FILE", "gym_machine_usage_10000_balanced.xlsx"))
-        
-        # Get unique values for each category
-        machines = sorted(df['machine_name'].unique().tolist())
-        workout_plans = sorted(df['workout_plan'].unique().tolist())
-        muscle_groups = sorted(df['muscle_group'].unique().tolist())
-        
-        return jsonify({
-            "success": True,
-            "machines": machines,
-            "workout_plans": workout_plans,
-            "muscle_groups": muscle_groups
-        })
-    except Exception as e:
-        # Fallback to common options if dataset can't be loaded
-        return jsonify({
-            "success": True,
-            "machines": [
-                "Treadmill", "Elliptical", "Stationary Bike", "Rowing Machine",
-                "Bench Press", "Leg Press", "Cable Machine", "Smith Machine",
-                "Dumbbells", "Barbell", "Pull-up Bar", "Lat Pulldown",
-                "Leg Curl", "Leg Extension", "Chest Press", "Shoulder Press"
-            ],
-            "workout_plans": [
-                "Cardio", "Strength", "Endurance", "Flexibility",
-                "HIIT", "Circuit Training", "Powerlifting", "Bodybuilding"
-            ],
-            "muscle_groups": [
-                "Legs", "Chest", "Back", "Arms", "Shoulders",
-                "Core", "Full Body", "Cardio", "Glutes", "Biceps", "Triceps"
-            ]
-        })
+    return jsonify({"success": True, **get_options_data()})
 
 
 if __name__ == '__main__':
-    # Load models on startup
-    if load_models():
+    # Load the frequency index synchronously, then the forest in the background
+    # so the server can answer from the index while the forest is loading
+    index_loaded = load_frequency_index()
+    load_drift_reference()
+    if BUILD_STATIC_ON_START and build_static.is_stale():
+        print("Building static assets...")
+        build_static.build()
+    load_asset_manifest()
+    if CAPTURE_ENABLED:
+        request_capture = RequestCapture(
+            CAPTURE_DIR,
+            max_queue=CAPTURE_MAX_QUEUE,
+            max_file_records=CAPTURE_MAX_FILE_RECORDS,
+            max_files=CAPTURE_MAX_FILES
+        )
+        request_capture.start()
+        atexit.register(request_capture.stop)
+    if index_loaded or os.path.exists(COMPACT_MODEL_PATH if MODEL_FORMAT == "compact" else MODEL_PATH):
+        threading.Thread(target=load_models, daemon=True).start()
         print(f"\n🚀 Starting Flask server on {HOST}:{PORT} (debug={DEBUG})...")
         print(f"📱 Open http://localhost:{PORT} in your browser")
         app.run(debug=DEBUG, host=HOST, port=PORT)
@@ -0,0 +1,85 @@
+"""
+Build content-hashed, precompressed static assets for the web UI.
+
+Copies each file in static/ to static/dist/<name>.<hash><ext> with gzip
+(and brotli, if the `brotli` package is installed) variants next to it, and
+writes static/dist/manifest.json mapping original names to hashed names.
+app.py serves these from /assets/ with far-future cache headers.
+
+app.py rebuilds automatically on startup when the build is missing or out of
+date (see is_stale). To build explicitly, e.g. in a deploy step:
+    python build_static.py
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+ASSETS = ["style.css", "script.js"]
+
+
+def asset_hash(name):
+    """Short content hash of a source asset."""
+    with open(os.path.join(STATIC_DIR, name), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def is_stale():
+    """True when the manifest is missing or does not match the current sources."""
+    try:
+        with open(os.path.join(DIST_DIR, "manifest.json")) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return True
+    for name in ASSETS:
+        stem, ext = os.path.splitext(name)
+        hashed_name = f"{stem}.{asset_hash(name)}{ext}"
+        if manifest.get(name) != hashed_name or not os.path.isfile(os.path.join(DIST_DIR, hashed_name)):
+            return True
+    return brotli is not None and not os.path.isfile(os.path.join(DIST_DIR, manifest[ASSETS[0]] + ".br"))
+
+
+def build():
+    """Write hashed and compressed assets plus the manifest."""
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    os.makedirs(DIST_DIR)
+
+    manifest = {}
+    for name in ASSETS:
+        with open(os.path.join(STATIC_DIR, name), "rb") as f:
+            content = f.read()
+
+        stem, ext = os.path.splitext(name)
+        hashed_name = f"{stem}.{asset_hash(name)}{ext}"
+        hashed_path = os.path.join(DIST_DIR, hashed_name)
+
+        with open(hashed_path, "wb") as f:
+            f.write(content)
+        with open(hashed_path + ".gz", "wb") as f:
+            f.write(gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(hashed_path + ".br", "wb") as f:
+                f.write(brotli.compress(content, quality=11))
+
+        manifest[name] = hashed_name
+        print(f"   {name} -> {hashed_name} ({len(content)} bytes)")
+
+    with open(os.path.join(DIST_DIR, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    if brotli is None:
+        print("⚠️ brotli not installed - only gzip variants were written (pip install -r requirements.txt)")
+    print(f"✅ Static assets built in {DIST_DIR}/")
+
+
+if __name__ == "__main__":
+    build()
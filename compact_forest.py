@@ -0,0 +1,122 @@
+"""
+Compact float32 representation of a fitted RandomForestClassifier.
+
+All trees are flattened into a handful of contiguous arrays:
+float32 thresholds, narrow integer feature indices, int32 child links and
+leaf class probabilities quantized to a configurable number of bits. This
+removes the per-tree Python object overhead of the pickled sklearn forest.
+
+Child links encode leaves as negative numbers: a value c >= 0 is an internal
+node index, a value c < 0 is leaf ~c.
+"""
+
+import numpy as np
+
+
+def export_compact_forest(model, leaf_bits=8):
+    """
+    Convert a fitted RandomForestClassifier into compact arrays.
+
+    Args:
+        model: Fitted RandomForestClassifier
+        leaf_bits: Bits per quantized leaf probability (2-16)
+
+    Returns:
+        dict: Arrays and metadata loadable by CompactForest
+    """
+    # 1 bit would round every leaf whose top class is <= 0.5 down to all zeros
+    if not 2 <= leaf_bits <= 16:
+        raise ValueError("leaf_bits must be between 2 and 16")
+    scale = 2 ** leaf_bits - 1
+    n_features = model.n_features_in_
+    feature_dtype = np.uint8 if n_features <= np.iinfo(np.uint8).max else np.uint16
+
+    features, thresholds, lefts, rights, leaf_values, roots = [], [], [], [], [], []
+    n_internal = 0
+    n_leaves = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        is_internal = tree.children_left != -1
+        internal = np.flatnonzero(is_internal)
+        leaves = np.flatnonzero(~is_internal)
+
+        # Renumber nodes: internal nodes and leaves get their own global ranges
+        code = np.empty(tree.node_count, dtype=np.int64)
+        code[internal] = n_internal + np.arange(len(internal))
+        code[leaves] = ~(n_leaves + np.arange(len(leaves)))
+
+        # Largest float32 <= each float64 threshold keeps x <= threshold exact for float32 inputs
+        threshold = tree.threshold[internal]
+        threshold32 = threshold.astype(np.float32)
+        rounded_up = threshold32 > threshold
+        threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+
+        values = tree.value[leaves, 0, :]
+        values = values / values.sum(axis=1, keepdims=True)
+
+        features.append(tree.feature[internal].astype(feature_dtype))
+        thresholds.append(threshold32)
+        lefts.append(code[tree.children_left[internal]])
+        rights.append(code[tree.children_right[internal]])
+        leaf_values.append(np.rint(values * scale))
+        roots.append(code[0])
+        n_internal += len(internal)
+        n_leaves += len(leaves)
+
+    return {
+        "classes": np.asarray(model.classes_),
+        "n_features": n_features,
+        "leaf_bits": leaf_bits,
+        "roots": np.asarray(roots, dtype=np.int32),
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "left": np.concatenate(lefts).astype(np.int32),
+        "right": np.concatenate(rights).astype(np.int32),
+        "leaf_values": np.vstack(leaf_values).astype(np.uint8 if leaf_bits <= 8 else np.uint16)
+    }
+
+
+class CompactForest:
+    """Vectorized predictor over arrays produced by export_compact_forest."""
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.classes_ = arrays["classes"]
+        self.n_features_in_ = arrays["n_features"]
+        self.roots = arrays["roots"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.leaf_values = arrays["leaf_values"]
+        self.scale = np.float32(2 ** arrays["leaf_bits"] - 1)
+
+    @property
+    def nbytes(self):
+        """Total size of the model arrays in bytes."""
+        return sum(value.nbytes for value in self.arrays.values() if isinstance(value, np.ndarray))
+
+    def apply(self, X):
+        """Leaf index reached in every tree, shape (n_samples, n_trees)."""
+        X = np.asarray(X, dtype=np.float32)
+        node = np.tile(self.roots, (len(X), 1))
+        rows = np.broadcast_to(np.arange(len(X))[:, None], node.shape)
+        active = node >= 0
+        # One step down every still-active path per iteration (max_depth iterations)
+        while active.any():
+            idx = node[active]
+            go_left = X[rows[active], self.feature[idx]] <= self.threshold[idx]
+            node[active] = np.where(go_left, self.left[idx], self.right[idx])
+            active = node >= 0
+        return ~node
+
+    def predict_proba(self, X):
+        """Class probabilities averaged over trees, like RandomForestClassifier."""
+        proba = self.leaf_values[self.apply(X)].sum(axis=1, dtype=np.float32)
+        total = proba.sum(axis=1, keepdims=True)
+        # Rows whose leaves all quantized to zero get a uniform distribution, not 0/0
+        return np.divide(proba, total, out=np.full_like(proba, 1 / proba.shape[1]), where=total > 0)
+
+    def predict(self, X):
+        """Predicted class for each row."""
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
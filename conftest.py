@@ -0,0 +1,50 @@
+"""
+Shared pytest configuration for the checks that run without a trained model.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import OneHotEncoder
+
+# Manual scripts that load the trained files from models/ at import time
+collect_ignore = ["test_prediction.py", "test_examples.py"]
+
+SMALL_CATEGORICAL_COLS = ['workout_day', 'machine_name']
+SMALL_NUMERICAL_COLS = ['start_hour', 'duration_min']
+
+
+@pytest.fixture(scope="session")
+def small_forest():
+    """
+    Small forest fitted on synthetic data laid out like the real features:
+    numerical columns first, then one-hot encoded categorical columns.
+    Crowd level depends on start_hour and machine_name only.
+    """
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({
+        'start_hour': rng.randint(0, 24, 600),
+        'duration_min': rng.uniform(5, 120, 600),
+        'workout_day': rng.choice(['Monday', 'Saturday', 'Sunday'], 600),
+        'machine_name': rng.choice(['Treadmill', 'Rowing Machine', 'Leg Press', 'Barbell'], 600)
+    })
+    y = (df['start_hour'] > 16).astype(int) + (df['machine_name'] == 'Treadmill').astype(int)
+
+    encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=False)
+    X_cat = pd.DataFrame(
+        encoder.fit_transform(df[SMALL_CATEGORICAL_COLS]),
+        columns=encoder.get_feature_names_out(SMALL_CATEGORICAL_COLS)
+    )
+    X = pd.concat([df[SMALL_NUMERICAL_COLS], X_cat], axis=1)
+    model = RandomForestClassifier(n_estimators=25, max_depth=6, random_state=0).fit(X, y)
+
+    return SimpleNamespace(
+        model=model,
+        encoder=encoder,
+        X=X,
+        categorical_cols=SMALL_CATEGORICAL_COLS,
+        numerical_cols=SMALL_NUMERICAL_COLS
+    )
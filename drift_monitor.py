@@ -0,0 +1,178 @@
+"""
+Constant-memory input drift monitoring for the prediction path.
+
+Keeps running counts for each categorical input (with an extra bucket for
+values the one-hot encoder has never seen), fixed-bin histograms for the
+numerical inputs and predicted-class frequencies. Memory is bounded by the
+number of known categories and bins, regardless of traffic.
+
+Counts are kept for a recent window only: two buckets of window_size samples,
+where the older bucket is discarded when the newer one fills. Scores always
+cover the last window_size to 2 * window_size requests, so a new shift is not
+diluted by weeks of earlier traffic.
+
+Drift is scored with the Population Stability Index (PSI) against the
+reference distributions saved by train_model.py. Rule of thumb: PSI < 0.1 is
+stable, 0.1-0.2 is a moderate shift and > 0.2 is significant drift. PSI is
+biased upwards on small samples, so no scores are reported until the window
+holds min_samples requests.
+"""
+
+import math
+import threading
+from bisect import bisect_right
+
+PSI_EPSILON = 1e-4
+PSI_DRIFT_THRESHOLD = 0.2
+DEFAULT_WINDOW_SIZE = 2500
+DEFAULT_MIN_SAMPLES = 500
+
+
+def population_stability_index(reference_counts, observed_counts):
+    """PSI between two count vectors over the same buckets."""
+    reference_total = sum(reference_counts) or 1
+    observed_total = sum(observed_counts) or 1
+    psi = 0.0
+    for ref, obs in zip(reference_counts, observed_counts):
+        p = max(ref / reference_total, PSI_EPSILON)
+        q = max(obs / observed_total, PSI_EPSILON)
+        psi += (q - p) * math.log(q / p)
+    return psi
+
+
+class DriftMonitor:
+    """Streaming counters over a recent window compared against a training-time reference."""
+
+    def __init__(self, reference, window_size=DEFAULT_WINDOW_SIZE, min_samples=DEFAULT_MIN_SAMPLES):
+        """
+        Args:
+            reference: Dict saved by train_model.py as drift_reference.pkl
+            window_size: Requests per window bucket (scores cover 1-2 buckets)
+            min_samples: Requests needed in the window before scores are reported
+        """
+        self.reference = reference
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self.samples = 0
+
+        self.category_index = {
+            col: {cat: i for i, cat in enumerate(spec["categories"])}
+            for col, spec in reference["categorical"].items()
+        }
+        self.bin_edges = {col: list(spec["edges"]) for col, spec in reference["numerical"].items()}
+        self.class_index = {cls: i for i, cls in enumerate(reference["predictions"]["classes"])}
+
+        self._current = self._new_window()
+        self._previous = self._new_window()
+
+    def _new_window(self):
+        return {
+            "samples": 0,
+            # Categorical: last bucket counts unknown values
+            "categorical": {col: [0] * (len(index) + 1) for col, index in self.category_index.items()},
+            # Numerical: first/last buckets count values below/above the edges
+            "numerical": {col: [0] * (len(edges) + 1) for col, edges in self.bin_edges.items()},
+            "predictions": [0] * len(self.class_index)
+        }
+
+    def _bin(self, col, value):
+        edges = self.bin_edges[col]
+        if value == edges[-1]:
+            # Match numpy.histogram: the last bin is closed on the right
+            return len(edges) - 1
+        return bisect_right(edges, value)
+
+    def update(self, categorical_values, numerical_values, crowd_level):
+        """
+        Record one prediction request.
+
+        Args:
+            categorical_values: Dict of categorical column -> raw input value
+            numerical_values: Dict of numerical column -> numeric input value
+            crowd_level: Predicted class label
+        """
+        cat_buckets = [
+            (col, self.category_index[col].get(value, len(self.category_index[col])))
+            for col, value in categorical_values.items() if col in self.category_index
+        ]
+        num_buckets = [
+            (col, self._bin(col, value))
+            for col, value in numerical_values.items() if col in self.bin_edges
+        ]
+        class_bucket = self.class_index.get(crowd_level)
+
+        with self._lock:
+            if self._current["samples"] >= self.window_size:
+                self._previous = self._current
+                self._current = self._new_window()
+            window = self._current
+            self.samples += 1
+            window["samples"] += 1
+            for col, bucket in cat_buckets:
+                window["categorical"][col][bucket] += 1
+            for col, bucket in num_buckets:
+                window["numerical"][col][bucket] += 1
+            if class_bucket is not None:
+                window["predictions"][class_bucket] += 1
+
+    def scores(self):
+        """
+        Drift scores over the recent window for every tracked input and the predicted classes.
+
+        Returns:
+            dict: Sample counts, status, per-feature PSI, unknown category rates and a drift
+                flag. PSI values are None while the window has fewer than min_samples requests.
+        """
+        with self._lock:
+            samples = self.samples
+            windows = (self._previous, self._current)
+            window_samples = sum(w["samples"] for w in windows)
+            category_counts = {
+                col: [sum(c) for c in zip(*(w["categorical"][col] for w in windows))]
+                for col in self.category_index
+            }
+            bin_counts = {
+                col: [sum(c) for c in zip(*(w["numerical"][col] for w in windows))]
+                for col in self.bin_edges
+            }
+            class_counts = [sum(c) for c in zip(*(w["predictions"] for w in windows))]
+
+        unknown_rate = {
+            col: round(counts[-1] / window_samples, 4) if window_samples else 0.0
+            for col, counts in category_counts.items()
+        }
+
+        if window_samples < self.min_samples:
+            return {
+                "samples": samples,
+                "window_samples": window_samples,
+                "min_samples": self.min_samples,
+                "status": "insufficient_samples",
+                "psi": None,
+                "prediction_psi": None,
+                "unknown_rate": unknown_rate,
+                "drift_detected": False
+            }
+
+        psi = {}
+        for col, counts in category_counts.items():
+            psi[col] = population_stability_index(self.reference["categorical"][col]["counts"], counts)
+        for col, counts in bin_counts.items():
+            psi[col] = population_stability_index(self.reference["numerical"][col]["counts"], counts)
+        prediction_psi = population_stability_index(self.reference["predictions"]["counts"], class_counts)
+
+        drift_detected = (
+            max(psi.values(), default=0.0) > PSI_DRIFT_THRESHOLD
+            or prediction_psi > PSI_DRIFT_THRESHOLD
+        )
+        return {
+            "samples": samples,
+            "window_samples": window_samples,
+            "min_samples": self.min_samples,
+            "status": "drift" if drift_detected else "ok",
+            "psi": {col: round(value, 4) for col, value in psi.items()},
+            "prediction_psi": round(prediction_psi, 4),
+            "unknown_rate": unknown_rate,
+            "drift_detected": drift_detected
+        }
@@ -0,0 +1,81 @@
+"""
+Historical frequency index: the fallback crowd level predictor.
+
+Dense crowd_level counts by (machine, day, hour), with an extra last machine
+row that aggregates all machines and is used for machine names not seen in
+training. The server answers from the precomputed probabilities with a single
+array lookup.
+"""
+
+import numpy as np
+
+DAY_MAPPING = {
+    'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
+    'Friday': 4, 'Saturday': 5, 'Sunday': 6
+}
+
+# Empty cells back off through these levels in order; hour is the strongest
+# signal in the data, so it is kept for as long as possible.
+BACKOFF_LEVELS = [
+    "machine, day, hour",
+    "all machines, day, hour",
+    "machine, hour",
+    "all machines, hour",
+    "machine",
+    "all machines"
+]
+
+
+def build_frequency_index(machine_names, day_nums, hours, labels, classes):
+    """
+    Count labels per (machine, day, hour) and derive backed-off probabilities.
+
+    Args:
+        machine_names: Machine name per row
+        day_nums: Day of week per row (0=Monday, as in DAY_MAPPING)
+        hours: Start hour per row (0-23)
+        labels: Encoded crowd_level per row (index into classes)
+        classes: Class names in label order
+
+    Returns:
+        tuple: (index dict saved as frequency_index.pkl,
+                number of machine cells answered at each BACKOFF_LEVELS step)
+    """
+    machines = sorted(set(machine_names))
+    machine_lookup = {m: i for i, m in enumerate(machines)}
+    machine_idx = np.array([machine_lookup[m] for m in machine_names], dtype=np.intp)
+
+    counts = np.zeros((len(machines) + 1, 7, 24, len(classes)), dtype=np.int32)
+    np.add.at(counts, (machine_idx, np.asarray(day_nums), np.asarray(hours), np.asarray(labels)), 1)
+    counts[-1] = counts[:-1].sum(axis=0)
+
+    all_machines = counts[-1:]
+    levels = [
+        counts,
+        all_machines,
+        counts.sum(axis=1, keepdims=True),
+        all_machines.sum(axis=1, keepdims=True),
+        counts.sum(axis=(1, 2), keepdims=True),
+        all_machines.sum(axis=(1, 2), keepdims=True)
+    ]
+
+    # Walk from the coarsest level to the finest, so each cell keeps the
+    # finest level that has observations
+    chosen = np.broadcast_to(levels[-1], counts.shape).astype(np.float64)
+    chosen_level = np.full(counts.shape[:-1], len(levels) - 1, dtype=np.int8)
+    for step in range(len(levels) - 2, -1, -1):
+        level = np.broadcast_to(levels[step], counts.shape)
+        has_data = level.sum(axis=-1) > 0
+        chosen = np.where(has_data[..., None], level, chosen)
+        chosen_level[has_data] = step
+
+    probabilities = chosen / np.maximum(chosen.sum(axis=-1, keepdims=True), 1)
+    level_counts = np.bincount(chosen_level[:-1].ravel(), minlength=len(levels)).tolist()
+
+    frequency_index = {
+        "machines": machines,
+        "classes": list(classes),
+        "counts": counts,
+        "probabilities": probabilities.astype(np.float32)
+    }
+    return frequency_index, level_counts
@@ -0,0 +1,168 @@
+"""
+Asynchronous buffered capture of prediction requests and outcomes.
+
+Request handlers push records into a bounded in-memory queue and never wait
+on disk I/O. A background writer drains the queue in batches and appends them
+to rotating JSON Lines files, which train_model.py reads back with
+load_captured_requests(). When the queue is full, records are dropped and
+counted instead of blocking the request. Only the newest max_files files are
+kept, so disk use is bounded.
+
+Captured crowd_level values are the server's predictions. To train on a
+record, a separate labelling step must add the crowd level actually observed
+in the OBSERVED_LABEL_COL field.
+"""
+
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+OBSERVED_LABEL_COL = "observed_crowd_level"
+
+
+class RequestCapture:
+    """Bounded queue plus background batch writer for prediction records."""
+
+    def __init__(self, directory, max_queue=10000, batch_size=256, flush_interval=2.0,
+                 max_file_records=50000, max_files=100):
+        """
+        Args:
+            directory: Folder for capture-*.jsonl files
+            max_queue: Records buffered in memory before new ones are dropped
+            batch_size: Records written per batch
+            flush_interval: Seconds before a partial batch is written
+            max_file_records: Records per file before rotating to a new file
+            max_files: Capture files kept on disk; older ones are deleted on rotation
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_records = max_file_records
+        self.max_files = max_files
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._counter_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._file_path = None
+        self._file_records = 0
+
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.write_errors = 0
+
+    def start(self):
+        """Start the background writer thread."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="request-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Flush buffered records and stop the writer thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, record):
+        """Queue a record without blocking; drop and count it if the queue is full."""
+        try:
+            self._queue.put_nowait(record)
+            accepted = True
+        except queue.Full:
+            accepted = False
+        with self._counter_lock:
+            if accepted:
+                self.captured += 1
+            else:
+                self.dropped += 1
+
+    def stats(self):
+        """Capture counters for the health endpoint."""
+        return {
+            "captured": self.captured,
+            "dropped": self.dropped,
+            "written": self.written,
+            "write_errors": self.write_errors,
+            "queued": self._queue.qsize(),
+            "writer_alive": self._thread is not None and self._thread.is_alive()
+        }
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=min(remaining, 0.5)))
+                except queue.Empty:
+                    if self._stop.is_set():
+                        break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        # Any failure is counted per record; the writer thread must never die
+        lines = []
+        for record in batch:
+            try:
+                lines.append(json.dumps(record) + "\n")
+            except Exception as e:
+                self.write_errors += 1
+                print(f"❌ Request capture could not serialize record: {e}")
+
+        while lines:
+            if self._file_path is None or self._file_records >= self.max_file_records:
+                self._rotate()
+            chunk = lines[:self.max_file_records - self._file_records]
+            lines = lines[len(chunk):]
+            try:
+                with open(self._file_path, "a", encoding="utf-8") as f:
+                    f.write("".join(chunk))
+                self._file_records += len(chunk)
+                self.written += len(chunk)
+            except Exception as e:
+                self.write_errors += len(chunk)
+                print(f"❌ Request capture write failed: {e}")
+
+    def _rotate(self):
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        self._file_path = os.path.join(self.directory, f"capture-{timestamp}.jsonl")
+        self._file_records = 0
+
+        # Timestamped names sort oldest first; keep room for the new file
+        existing = sorted(glob.glob(os.path.join(self.directory, "capture-*.jsonl")))
+        for path in existing[:max(len(existing) - self.max_files + 1, 0)]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"⚠️ Could not remove old capture file {path}: {e}")
+
+
+def load_captured_requests(directory):
+    """
+    Read all captured records back into a DataFrame.
+
+    Args:
+        directory: Folder containing capture-*.jsonl files
+
+    Returns:
+        pd.DataFrame: One row per captured prediction (empty if none)
+    """
+    frames = [
+        pd.read_json(path, lines=True)
+        for path in sorted(glob.glob(os.path.join(directory, "capture-*.jsonl")))
+        if os.path.getsize(path) > 0
+    ]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
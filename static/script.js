@@ -130,61 +130,34 @@ function setLoading(loading) {
     }
 }
 
-// Load dropdown options on page load
-async function loadOptions() {
-    try {
-        const response = await fetch(`${API_BASE_URL}/options`);
-        const data = await response.json();
-        
-        if (data.success) {
-            // Populate machine name dropdown
-            const machineSelect = document.getElementById('machine_name');
-            data.machines.forEach(machine => {
-                const option = document.createElement('option');
-                option.value = machine;
-                option.textContent = machine;
-                machineSelect.appendChild(option);
-            });
-            
-            // Populate workout plan dropdown
-            const workoutPlanSelect = document.getElementById('workout_plan');
-            data.workout_plans.forEach(plan => {
-                const option = document.createElement('option');
-                option.value = plan;
-                option.textContent = plan;
-                workoutPlanSelect.appendChild(option);
-            });
-            
-            // Populate muscle group dropdown
-            const muscleGroupSelect = document.getElementById('muscle_group');
-            data.muscle_groups.forEach(group => {
-                const option = document.createElement('option');
-                option.value = group;
-                option.textContent = group;
-                muscleGroupSelect.appendChild(option);
-            });
-        }
-    } catch (error) {
-        console.error('Error loading options:', error);
-        // Options will remain empty, user can still type if needed
-    }
+// Populate a dropdown with a list of values
+function populateSelect(selectId, values) {
+    const select = document.getElementById(selectId);
+    values.forEach(value => {
+        const option = document.createElement('option');
+        option.value = value;
+        option.textContent = value;
+        select.appendChild(option);
+    });
 }
 
-// Check API health and load options on page load
+// Load dropdown options, model version and health in a single request on page load
 window.addEventListener('DOMContentLoaded', async () => {
-    // Load dropdown options
-    await loadOptions();
-    
-    // Check API health
     try {
-        const response = await fetch(`${API_BASE_URL}/health`);
+        const response = await fetch(`${API_BASE_URL}/bootstrap`);
         const data = await response.json();
         
-        if (!data.model_loaded) {
+        if (data.success) {
+            populateSelect('machine_name', data.options.machines);
+            populateSelect('workout_plan', data.options.workout_plans);
+            populateSelect('muscle_group', data.options.muscle_groups);
+        }
+        
+        if (!data.health.model_loaded && !data.health.frequency_index_loaded) {
             displayError('Warning: Model not loaded. Please ensure the model is trained.');
         }
     } catch (error) {
-        console.error('Health check failed:', error);
+        console.error('Bootstrap failed:', error);
         displayError('Warning: Unable to connect to server. Please ensure Flask is running.');
     }
 });
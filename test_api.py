@@ -0,0 +1,120 @@
+"""
+/api/predict mode handling, 503 responses and the frequency index fallback,
+exercised through Flask's test client with small synthetic indexes.
+"""
+
+import threading
+
+import numpy as np
+
+import app as server
+from frequency_index import build_frequency_index
+
+REQUEST = {
+    "machine_name": "Treadmill",
+    "workout_day": "Monday",
+    "workout_plan": "Cardio",
+    "muscle_group": "Legs",
+    "start_hour": 18,
+    "duration_min": 30
+}
+
+
+def install_frequency_index():
+    """Two machines plus the all-machines row; Treadmill on Monday 18:00 is High."""
+    probabilities = np.full((3, 7, 24, 3), 1 / 3, dtype=np.float32)
+    probabilities[0, 0, 18] = [0.7, 0.1, 0.2]
+    probabilities[2, 0, 18] = [0.1, 0.8, 0.1]
+    server.frequency_index = {"machines": ["Treadmill", "Rowing Machine"]}
+    server.index_machine_lookup = {"Treadmill": 0, "Rowing Machine": 1, None: 2}
+    server.index_probabilities = probabilities
+    server.index_classes = ["High", "Low", "Medium"]
+
+
+def reset_server():
+    server.model = None
+    server.frequency_index = None
+    server.forest_slots = threading.BoundedSemaphore(server.MAX_FOREST_INFLIGHT)
+
+
+def post(payload, query=""):
+    response = server.app.test_client().post(f"/api/predict{query}", json=payload)
+    return response.status_code, response.get_json()
+
+
+def test_nothing_loaded_returns_503():
+    reset_server()
+    for mode in ("auto", "forest", "frequency"):
+        status, data = post({**REQUEST, "mode": mode})
+        assert status == 503 and data["success"] is False
+
+
+def test_invalid_mode_returns_400():
+    reset_server()
+    status, _ = post({**REQUEST, "mode": "fastest"})
+    assert status == 400
+
+
+def test_index_answers_while_forest_is_loading():
+    reset_server()
+    install_frequency_index()
+    status, data = post(REQUEST)
+    assert status == 200
+    assert data["predictor"] == "frequency_index"
+    assert data["crowd_level"] == "High"
+    assert abs(sum(data["probabilities"].values()) - 1) < 1e-6
+
+    # Explicitly asking for the forest still fails until it is loaded
+    status, _ = post({**REQUEST, "mode": "forest"})
+    assert status == 503
+
+
+def test_unknown_machine_uses_all_machines_row():
+    reset_server()
+    install_frequency_index()
+    status, data = post({**REQUEST, "machine_name": "Hover Board", "mode": "frequency"})
+    assert status == 200 and data["crowd_level"] == "Low"
+
+
+def test_empty_peak_hour_cell_keeps_the_hour():
+    # Treadmill has no Monday 18:00 rows, but other machines do (all High)
+    rows = [
+        ("Treadmill", 0, 13, 1), ("Treadmill", 2, 18, 0), ("Treadmill", 0, 10, 2),
+        ("Rowing Machine", 0, 18, 0), ("Rowing Machine", 0, 13, 1), ("Rowing Machine", 3, 13, 1)
+    ]
+    machines, days, hours, labels = zip(*rows)
+    index, level_counts = build_frequency_index(machines, days, hours, labels, ["High", "Low", "Medium"])
+
+    reset_server()
+    server.frequency_index = index
+    server.index_machine_lookup = {m: i for i, m in enumerate(index["machines"])}
+    server.index_machine_lookup[None] = len(index["machines"])
+    server.index_probabilities = index["probabilities"]
+    server.index_classes = index["classes"]
+
+    status, data = post({**REQUEST, "mode": "frequency"})
+    assert status == 200
+    assert data["crowd_level"] == "High"
+    assert data["probabilities"]["High"] == 1.0
+
+    # No machine has Thursday 18:00 data, so the (machine, hour) level answers
+    status, data = post({**REQUEST, "workout_day": "Thursday", "machine_name": "Rowing Machine",
+                         "mode": "frequency"})
+    assert data["crowd_level"] == "High"
+    assert sum(level_counts) == 2 * 7 * 24
+
+
+def test_load_shedding_falls_back_to_index():
+    reset_server()
+    install_frequency_index()
+    server.model = object()  # never called: every forest slot is taken
+    server.forest_slots = threading.BoundedSemaphore(1)
+    server.forest_slots.acquire()
+    try:
+        status, data = post(REQUEST, query="?explain=true")
+        assert status == 200
+        assert data["predictor"] == "frequency_index"
+        assert data["explanation"] is None
+        assert data["explanation_unavailable"]
+    finally:
+        reset_server()
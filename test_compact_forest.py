@@ -0,0 +1,43 @@
+"""
+Checks for the compact float32 forest export against the sklearn forest it came from.
+"""
+
+import numpy as np
+import pytest
+
+from compact_forest import export_compact_forest, CompactForest
+
+
+def test_matches_sklearn_forest(small_forest):
+    model, X = small_forest.model, small_forest.X
+    compact = CompactForest(export_compact_forest(model, leaf_bits=16))
+
+    np.testing.assert_array_equal(compact.predict(X), model.predict(X))
+    np.testing.assert_allclose(compact.predict_proba(X), model.predict_proba(X), atol=1e-3)
+    assert compact.threshold.dtype == np.float32
+    assert compact.feature.dtype == np.uint8
+
+
+def test_apply_matches_sklearn_leaves(small_forest):
+    model, X = small_forest.model, small_forest.X
+    compact = CompactForest(export_compact_forest(model))
+    leaves = compact.apply(X)
+    # Same leaf in every tree means the same leaf probabilities
+    for t, estimator in enumerate(model.estimators_):
+        expected = estimator.tree_.value[estimator.apply(X.to_numpy(dtype=np.float32)), 0, :]
+        expected = expected / expected.sum(axis=1, keepdims=True)
+        got = compact.leaf_values[leaves[:, t]] / compact.scale
+        np.testing.assert_allclose(got, expected, atol=0.5 / compact.scale + 1e-6)
+
+
+def test_rejects_one_bit_leaves(small_forest):
+    with pytest.raises(ValueError):
+        export_compact_forest(small_forest.model, leaf_bits=1)
+
+
+def test_all_zero_leaves_give_uniform_probabilities(small_forest):
+    arrays = export_compact_forest(small_forest.model, leaf_bits=2)
+    arrays["leaf_values"] = np.zeros_like(arrays["leaf_values"])
+    proba = CompactForest(arrays).predict_proba(small_forest.X.iloc[:3])
+    assert not np.isnan(proba).any()
+    np.testing.assert_allclose(proba, 1 / 3)
@@ -0,0 +1,75 @@
+"""
+Checks for DriftMonitor binning, the minimum sample gate and the rolling window.
+"""
+
+from drift_monitor import DriftMonitor, population_stability_index
+
+REFERENCE = {
+    "categorical": {
+        "machine_name": {"categories": ["Treadmill", "Rowing Machine"], "counts": [50, 50, 0]}
+    },
+    "numerical": {
+        "start_hour": {"edges": list(range(25)), "counts": [0] + [10] * 24 + [0]}
+    },
+    "predictions": {"classes": ["High", "Low", "Medium"], "counts": [10, 10, 10]}
+}
+
+
+def feed(monitor, n, machine="Treadmill", hour=None):
+    """Send n requests that follow the reference unless overridden."""
+    machines = ["Treadmill", "Rowing Machine"]
+    classes = ["High", "Low", "Medium"]
+    for i in range(n):
+        monitor.update(
+            {"machine_name": machine or machines[i % 2]},
+            {"start_hour": i % 24 if hour is None else hour},
+            classes[i % 3]
+        )
+
+
+def test_bin_edges_and_overflow():
+    monitor = DriftMonitor(REFERENCE)
+    assert monitor._bin("start_hour", -1) == 0    # underflow bucket
+    assert monitor._bin("start_hour", 0) == 1     # first bin [0, 1)
+    assert monitor._bin("start_hour", 0.5) == 1
+    assert monitor._bin("start_hour", 23) == 24   # last bin [23, 24]
+    assert monitor._bin("start_hour", 24) == 24   # closed on the right, like numpy
+    assert monitor._bin("start_hour", 25) == 25   # overflow bucket
+
+
+def test_identical_distributions_have_zero_psi():
+    assert population_stability_index([1, 2, 3], [10, 20, 30]) < 1e-12
+
+
+def test_insufficient_samples_reports_no_drift():
+    monitor = DriftMonitor(REFERENCE, window_size=100, min_samples=50)
+    feed(monitor, 10, machine="Unknown Machine")
+    scores = monitor.scores()
+    assert scores["status"] == "insufficient_samples"
+    assert scores["psi"] is None
+    assert scores["drift_detected"] is False
+    assert scores["unknown_rate"]["machine_name"] == 1.0
+
+
+def test_matching_traffic_is_not_drift():
+    monitor = DriftMonitor(REFERENCE, window_size=240, min_samples=240)
+    feed(monitor, 240, machine=None)
+    scores = monitor.scores()
+    assert scores["status"] == "ok"
+    assert scores["drift_detected"] is False
+
+
+def test_window_forgets_old_traffic():
+    monitor = DriftMonitor(REFERENCE, window_size=240, min_samples=240)
+    feed(monitor, 240 * 10, machine=None)
+    # A shift after long normal traffic shows up once it fills a window
+    feed(monitor, 240, machine=None, hour=3)
+    scores = monitor.scores()
+    assert scores["samples"] == 240 * 11
+    assert scores["window_samples"] == 480
+    assert scores["psi"]["start_hour"] > 0.2
+    assert scores["drift_detected"] is True
+
+    # And older normal traffic has been dropped entirely after two more windows
+    feed(monitor, 480, machine=None, hour=3)
+    assert monitor.scores()["psi"]["start_hour"] > 2
@@ -0,0 +1,86 @@
+"""
+Checks for the request capture queue and its background writer: dropping when
+full, file rotation and retention, and surviving bad records.
+"""
+
+import glob
+import json
+import os
+import tempfile
+import time
+
+from request_capture import RequestCapture, load_captured_requests
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll until condition() is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def test_drop_on_full_queue():
+    with tempfile.TemporaryDirectory() as directory:
+        capture = RequestCapture(directory, max_queue=5)
+        # Writer not started: the queue fills and further records are dropped
+        for i in range(8):
+            capture.submit({"i": i})
+        stats = capture.stats()
+        assert stats["captured"] == 5
+        assert stats["dropped"] == 3
+        assert stats["queued"] == 5
+        assert stats["writer_alive"] is False
+
+
+def test_rotation_and_read_back():
+    with tempfile.TemporaryDirectory() as directory:
+        capture = RequestCapture(directory, batch_size=4, flush_interval=0.05, max_file_records=3)
+        capture.start()
+        for i in range(7):
+            capture.submit({"i": i, "crowd_level": "Low"})
+        assert wait_for(lambda: capture.written == 7)
+        capture.stop()
+
+        files = sorted(glob.glob(os.path.join(directory, "capture-*.jsonl")))
+        assert len(files) == 3
+        assert [sum(1 for _ in open(path)) for path in files] == [3, 3, 1]
+        assert sorted(load_captured_requests(directory)["i"].tolist()) == list(range(7))
+
+
+def test_retention_limit():
+    with tempfile.TemporaryDirectory() as directory:
+        capture = RequestCapture(directory, batch_size=1, flush_interval=0.05,
+                                 max_file_records=1, max_files=2)
+        capture.start()
+        for i in range(5):
+            capture.submit({"i": i})
+            # Distinct timestamps keep file names ordered
+            assert wait_for(lambda: capture.written == i + 1)
+        capture.stop()
+
+        files = sorted(glob.glob(os.path.join(directory, "capture-*.jsonl")))
+        assert len(files) == 2
+        assert [json.loads(open(path).read())["i"] for path in files] == [3, 4]
+
+
+def test_bad_record_does_not_kill_writer():
+    with tempfile.TemporaryDirectory() as directory:
+        capture = RequestCapture(directory, batch_size=3, flush_interval=0.05)
+        capture.start()
+        capture.submit({"i": 0})
+        capture.submit({"i": object()})  # not JSON serializable
+        capture.submit({"i": 2})
+        assert wait_for(lambda: capture.written + capture.write_errors == 3)
+
+        capture.submit({"i": 3})
+        assert wait_for(lambda: capture.written == 3)
+        stats = capture.stats()
+        assert stats["write_errors"] == 1
+        assert stats["writer_alive"] is True
+        capture.stop()
+
+
+def test_empty_directory_reads_back_empty():
+    with tempfile.TemporaryDirectory() as directory:
+        assert load_captured_requests(directory).empty
@@ -0,0 +1,90 @@
+"""
+Checks for the static asset build, /assets/ serving and /api/bootstrap.
+
+Assets are built into pytest's tmp_path; module state touched by a test is
+restored through monkeypatch.
+"""
+
+import gzip
+import os
+
+import brotli
+import pytest
+
+import app as server
+import build_static
+
+
+@pytest.fixture
+def built_assets(tmp_path, monkeypatch):
+    """Build assets into a temporary dist folder and point the server at it."""
+    dist = str(tmp_path / "dist")
+    monkeypatch.setattr(build_static, "DIST_DIR", dist)
+    monkeypatch.setattr(server, "ASSET_DIR", dist)
+    monkeypatch.setattr(server, "asset_manifest", {})
+    build_static.build()
+    server.load_asset_manifest()
+    return dist
+
+
+def test_build_writes_hashed_and_compressed_assets(built_assets):
+    for name, hashed_name in server.asset_manifest.items():
+        with open(os.path.join(build_static.STATIC_DIR, name), "rb") as f:
+            original = f.read()
+        path = os.path.join(built_assets, hashed_name)
+        assert hashed_name != name
+        assert open(path, "rb").read() == original
+        assert gzip.decompress(open(path + ".gz", "rb").read()) == original
+        assert brotli.decompress(open(path + ".br", "rb").read()) == original
+    assert not build_static.is_stale()
+
+    # Removing a built file makes the build stale again
+    os.remove(os.path.join(built_assets, server.asset_manifest["script.js"]))
+    assert build_static.is_stale()
+
+
+def test_assets_negotiate_encoding_and_cache_forever(built_assets):
+    client = server.app.test_client()
+    url = f"/assets/{server.asset_manifest['style.css']}"
+
+    for accept, encoding in (("gzip, deflate, br", "br"), ("gzip", "gzip"), ("", None),
+                             ("br;q=0, gzip", "gzip"), ("gzip;q=0", None), ("*", "br")):
+        response = client.get(url, headers={"Accept-Encoding": accept})
+        assert response.status_code == 200
+        assert response.headers.get("Content-Encoding") == encoding
+        assert response.mimetype == "text/css"
+        assert "immutable" in response.headers["Cache-Control"]
+        assert "max-age=31536000" in response.headers["Cache-Control"]
+        assert "Accept-Encoding" in response.headers["Vary"]
+        response.close()
+
+    page = client.get("/").get_data(as_text=True)
+    assert url in page
+
+
+def test_page_uses_plain_files_after_build_fixture():
+    # Runs after the fixtures above have been torn down: no leaked manifest
+    page = server.app.test_client().get("/").get_data(as_text=True)
+    assert "/static/style.css" in page and "/assets/" not in page
+
+
+def test_bootstrap_is_one_cacheable_payload(monkeypatch):
+    client = server.app.test_client()
+    monkeypatch.setattr(server, "options_cache", {
+        "machines": ["Treadmill"], "workout_plans": ["Cardio"], "muscle_groups": ["Legs"]
+    })
+    monkeypatch.setattr(server, "model", object())
+
+    response = client.get("/api/bootstrap")
+    data = response.get_json()
+    assert data["options"]["machines"] == ["Treadmill"]
+    assert data["model"]["loaded"] is True
+    assert data["health"]["status"] == "healthy"
+    assert response.cache_control.max_age == server.BOOTSTRAP_MAX_AGE
+
+    again = client.get("/api/bootstrap", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+
+    # Not cached while the model is still loading
+    monkeypatch.setattr(server, "model", None)
+    assert client.get("/api/bootstrap").cache_control.no_cache
@@ -0,0 +1,44 @@
+"""
+Checks that path-based contributions add up to predict_proba and fold back to
+the original input columns.
+"""
+
+import numpy as np
+import pytest
+
+from tree_explainer import ForestExplainer
+
+
+@pytest.fixture(scope="module")
+def explainer(small_forest):
+    return ForestExplainer(
+        small_forest.model, small_forest.X.columns.tolist(), small_forest.categorical_cols,
+        small_forest.numerical_cols, small_forest.encoder
+    )
+
+
+def test_contributions_sum_to_predict_proba(small_forest, explainer):
+    bias, contributions = explainer.explain(small_forest.X)
+    np.testing.assert_allclose(bias + contributions.sum(axis=1),
+                               small_forest.model.predict_proba(small_forest.X), atol=1e-9)
+
+
+def test_contributions_fold_to_original_columns(small_forest, explainer):
+    _, contributions = explainer.explain(small_forest.X.iloc[:5])
+    assert explainer.columns == small_forest.numerical_cols + small_forest.categorical_cols
+    assert contributions.shape == (5, len(explainer.columns), 3)
+
+
+def test_batch_matches_single_rows(small_forest, explainer):
+    X = small_forest.X
+    _, batch = explainer.explain(X.iloc[:10])
+    for i in range(10):
+        _, single = explainer.explain(X.iloc[i:i + 1])
+        np.testing.assert_allclose(single[0], batch[i])
+
+
+def test_signal_features_dominate(small_forest, explainer):
+    _, contributions = explainer.explain(small_forest.X)
+    importance = np.abs(contributions).sum(axis=(0, 2))
+    ranked = [explainer.columns[i] for i in np.argsort(importance)[::-1]]
+    assert set(ranked[:2]) == {'start_hour', 'machine_name'}
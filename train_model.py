@@ -9,6 +9,7 @@ for FastAPI integration.
 Author: Final Year Project
 """
 
+import numpy as np
 import pandas as pd
 import joblib
 from sklearn.model_selection import train_test_split
@@ -18,7 +19,17 @@ from sklearn.metrics import accuracy_score, classification_report
 
 import os
 
+from request_capture import load_captured_requests, OBSERVED_LABEL_COL
+from compact_forest import export_compact_forest, CompactForest
+from tree_explainer import ForestExplainer
+from frequency_index import build_frequency_index, BACKOFF_LEVELS, DAY_MAPPING
+
 MODEL_DIR = "models"
+# Set TRAIN_ON_CAPTURED=1 to add captured requests that have an observed crowd level
+TRAIN_ON_CAPTURED = os.getenv("TRAIN_ON_CAPTURED", "0") in ("1", "true", "True")
+CAPTURE_DIR = os.getenv("CAPTURE_DIR", "captures")
+# Bits per quantized leaf probability in the compact model export
+COMPACT_LEAF_BITS = int(os.getenv("COMPACT_LEAF_BITS", 8))
 os.makedirs(MODEL_DIR, exist_ok=True)
 # =========================
 # 1. LOAD DATA
@@ -84,6 +95,26 @@ X_train, X_test, y_train, y_test = train_test_split(
     stratify=y_encoded
 )
 
+# Captured requests only carry the crowd_level the server predicted, which is
+# not ground truth. Rows are used once a separate labelling step has added the
+# observed crowd level, and only for training: they stay out of the test split,
+# the frequency index and the drift reference.
+if TRAIN_ON_CAPTURED:
+    captured = load_captured_requests(CAPTURE_DIR)
+    if OBSERVED_LABEL_COL in captured.columns:
+        captured = captured[captured[OBSERVED_LABEL_COL].isin(label_encoder.classes_)]
+    else:
+        captured = captured.iloc[0:0]
+    if not captured.empty:
+        X_captured_cat = pd.DataFrame(
+            onehot_encoder.transform(captured[categorical_cols]),
+            columns=onehot_encoder.get_feature_names_out(categorical_cols)
+        )
+        X_captured = pd.concat([captured[numerical_cols].reset_index(drop=True), X_captured_cat], axis=1)
+        X_train = pd.concat([X_train, X_captured[X_final.columns]], ignore_index=True)
+        y_train = np.concatenate([y_train, label_encoder.transform(captured[OBSERVED_LABEL_COL])])
+    print(f"Added {len(captured)} labelled captured requests from {CAPTURE_DIR}/ to the training split")
+
 
 # =========================
 # 5. MODEL TRAINING (ANTI-OVERFITTING)
@@ -120,9 +151,101 @@ joblib.dump(X_final.columns.tolist(), os.path.join(MODEL_DIR, "feature_columns.p
 joblib.dump(categorical_cols, os.path.join(MODEL_DIR, "categorical_cols.pkl"))
 joblib.dump(numerical_cols, os.path.join(MODEL_DIR, "numerical_cols.pkl"))
 
+
+# =========================
+# 8. HISTORICAL FREQUENCY INDEX (FALLBACK PREDICTOR)
+# =========================
+# The day axis uses workout_day, the key the server looks up. It is not the
+# weekday of `date` (day_of_week_num), which disagrees with it in most rows.
+frequency_index, level_counts = build_frequency_index(
+    df['machine_name'].tolist(),
+    df['workout_day'].map(DAY_MAPPING).to_numpy(),
+    df['start_hour'].to_numpy(),
+    y_encoded,
+    label_encoder.classes_.tolist()
+)
+joblib.dump(frequency_index, os.path.join(MODEL_DIR, "frequency_index.pkl"))
+
+print(f"\nFrequency index: {len(frequency_index['machines'])} machines x 7 days x 24 hours")
+for level, count in zip(BACKOFF_LEVELS, level_counts):
+    print(f"   Cells answered from ({level}): {count}")
+
+
+# =========================
+# 9. DRIFT REFERENCE DISTRIBUTIONS
+# =========================
+# Compared against live request traffic by drift_monitor.DriftMonitor.
+# Categorical counts carry a trailing zero bucket for unknown values and
+# numerical histograms carry zero underflow/overflow buckets.
+n_classes = len(label_encoder.classes_)
+numerical_bin_edges = {
+    'start_hour': np.arange(0, 25),
+    'duration_min': np.histogram_bin_edges(df['duration_min'], bins=20),
+    'day_of_week_num': np.arange(0, 8)
+}
+
+drift_reference = {
+    "categorical": {
+        col: {
+            "categories": cats.tolist(),
+            "counts": X_cat[col].value_counts().reindex(cats, fill_value=0).tolist() + [0]
+        }
+        for col, cats in zip(categorical_cols, onehot_encoder.categories_)
+    },
+    "numerical": {
+        col: {
+            "edges": edges.tolist(),
+            "counts": [0] + np.histogram(X_num[col], bins=edges)[0].tolist() + [0]
+        }
+        for col, edges in numerical_bin_edges.items()
+    },
+    "predictions": {
+        "classes": label_encoder.classes_.tolist(),
+        "counts": np.bincount(y_pred, minlength=n_classes).tolist()
+    }
+}
+joblib.dump(drift_reference, os.path.join(MODEL_DIR, "drift_reference.pkl"))
+
+
+# =========================
+# 10. COMPACT FLOAT32 MODEL EXPORT
+# =========================
+compact_arrays = export_compact_forest(model, leaf_bits=COMPACT_LEAF_BITS)
+joblib.dump(compact_arrays, os.path.join(MODEL_DIR, "gym_model_compact.pkl"))
+
+# Verify the compact model against the original on the test split
+compact_model = CompactForest(compact_arrays)
+compact_proba = compact_model.predict_proba(X_test)
+compact_pred = compact_model.predict(X_test)
+disagreements = int((compact_pred != y_pred).sum())
+max_proba_diff = float(np.abs(compact_proba - model.predict_proba(X_test)).max())
+
+original_size = os.path.getsize(os.path.join(MODEL_DIR, "gym_model.pkl"))
+compact_size = os.path.getsize(os.path.join(MODEL_DIR, "gym_model_compact.pkl"))
+print(f"\nCompact model ({COMPACT_LEAF_BITS}-bit leaves):")
+print(f"   File size: {compact_size / 1024:.1f} KB (original {original_size / 1024:.1f} KB, "
+      f"{original_size / compact_size:.1f}x smaller)")
+print(f"   Array memory: {compact_model.nbytes / 1024:.1f} KB")
+print(f"   Test accuracy: {accuracy_score(y_test, compact_pred)}")
+print(f"   Label disagreements with original: {disagreements} / {len(y_test)}")
+print(f"   Max probability difference: {max_proba_diff:.6f}")
+
+# Verify the explainer: bias + contributions must reproduce predict_proba
+explainer = ForestExplainer(model, X_final.columns.tolist(), categorical_cols, numerical_cols, onehot_encoder)
+bias, contributions = explainer.explain(X_test)
+explained_proba = bias + contributions.sum(axis=1)
+explainer_ok = np.allclose(explained_proba, model.predict_proba(X_test), atol=1e-6)
+print(f"\nExplainer additivity check (bias + contributions == predict_proba): "
+      f"{'passed' if explainer_ok else 'FAILED'}")
+if not explainer_ok:
+    print(f"   ⚠️ Max difference: {np.abs(explained_proba - model.predict_proba(X_test)).max():.6f}")
+
 print("\n✅ Model training complete.")
 print("✅ Files saved:")
 print("   - gym_model.joblib")
 print("   - onehot_encoder.joblib")
 print("   - label_encoder.joblib")
 print("   - feature_columns.joblib")
+print("   - frequency_index.pkl")
+print("   - drift_reference.pkl")
+print("   - gym_model_compact.pkl")